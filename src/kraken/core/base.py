@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import abc
 import contextlib
+from contextvars import ContextVar
 from typing import Any, Callable, ClassVar, Generic, Iterator, List, Optional, TypeVar, cast, overload
 
 from nr.stream import NotSet
@@ -46,12 +47,23 @@ class CurrentProvider(abc.ABC, Generic[T]):
 
     @classmethod
     def current(cls, fallback: U | NotSet = NotSet.Value) -> T | U:
+        current = cls._get_current_object_or_none()
+        if current is not None:
+            return current
+        if isinstance(fallback, NotSet):
+            return cls._get_current_object()
+        return fallback
+
+    @classmethod
+    def _get_current_object_or_none(cls) -> T | None:
+        """Returns the current object or `None`. Subclasses should override this method if they can determine the
+        current object without raising an exception, allowing :meth:`current` to avoid the exception overhead when
+        a *fallback* is given."""
+
         try:
             return cls._get_current_object()
         except RuntimeError:
-            if isinstance(fallback, NotSet):
-                raise
-            return fallback
+            return None
 
     @classmethod
     @abc.abstractmethod
@@ -60,19 +72,35 @@ class CurrentProvider(abc.ABC, Generic[T]):
 
 
 class Currentable(CurrentProvider[T]):
-    __current: ClassVar[Optional[Any]] = None  # note: ClassVar cannot contain type variables
+    """Base class for objects that can be made the current object of their type with :meth:`as_current`. Each
+    subclass gets its own :class:`~contextvars.ContextVar`, so the current object is local to the thread or
+    asynchronous task that set it.
+
+    Note that threads do not inherit the current objects of the thread that started them. A thread started with
+    :class:`threading.Thread` or a :class:`~concurrent.futures.ThreadPoolExecutor` sees no current object unless
+    its target is run with :func:`contextvars.copy_context().run() <contextvars.copy_context>`."""
+
+    __current: ClassVar[ContextVar[Any]]  # note: ClassVar cannot contain type variables
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.__current = ContextVar(f"{cls.__module__}.{cls.__qualname__}.current", default=None)
+
+    @classmethod
+    def _get_current_object_or_none(cls) -> T | None:
+        return cast(Optional[T], cls.__current.get())
 
     @classmethod
     def _get_current_object(cls) -> T:
-        if cls.__current is None:
+        current = cls.__current.get()
+        if current is None:
             raise RuntimeError(f"No current object for type `{cls.__name__}`")
-        return cast(T, cls.__current)
+        return cast(T, current)
 
     @contextlib.contextmanager
     def as_current(self) -> Iterator[None]:
-        prev = type(self).__current
+        token = type(self).__current.set(self)
         try:
-            type(self).__current = self
             yield
         finally:
-            type(self).__current = prev
+            type(self).__current.reset(token)
@@ -148,7 +148,8 @@ def run(
 ) -> None:
 
     from kraken.core import BuildError
-    from kraken.core.cli.executor import ColoredDefaultPrintingExecutorObserver
+    from kraken.core.executor.colored import ColoredDefaultPrintingExecutorObserver
+    from kraken.core.executor.default import DefaultGraphExecutor
 
     context, graph = _load_build_state(
         exit_stack=exit_stack,
@@ -161,6 +162,14 @@ def run(
         context.resolve_tasks(run_options.exclude_tasks_subgraph or []),
     )
 
+    if run_options.jobs > 1:
+        # Do not replace an executor that was configured by the build script.
+        executor = context.executor
+        if type(executor) is DefaultGraphExecutor and executor.max_workers == 1:
+            context.executor = DefaultGraphExecutor(executor.task_executor, max_workers=run_options.jobs)
+        else:
+            print("note: -j,--jobs is ignored because the build uses a custom executor.", file=sys.stderr)
+
     if run_options.skip_build:
         print("note: skipped build due to -s,--skip-build option.")
         sys.exit(0)
@@ -187,7 +196,7 @@ def ls(graph: TaskGraph) -> None:
     from termcolor import colored
 
     from kraken.core import GroupTask
-    from kraken.core.cli.executor import status_to_text
+    from kraken.core.executor.colored import status_to_text
     from kraken.core.util.term import get_terminal_width
 
     goal_tasks = set(graph.tasks(goals=True))
@@ -13,6 +13,20 @@ DEFAULT_PROJECT_DIR = Path(".")
 BUILD_STATE_DIR = ".kraken/buildenv"
 
 
+def _jobs_type(value: str) -> int:
+    """Argument type for the number of jobs, which must be a positive integer."""
+
+    import argparse
+
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {jobs}")
+    return jobs
+
+
 @dataclasses.dataclass(frozen=True)
 class LoggingOptions:
     # NOTE (@NiklasRosenstein): This class is considered public API; the kraken-wrapper module uses it.
@@ -182,6 +196,7 @@ class RunOptions:
     skip_build: bool
     exclude_tasks: list[str] | None
     exclude_tasks_subgraph: list[str] | None
+    jobs: int
 
     @staticmethod
     def add_to_parser(parser: argparse.ArgumentParser) -> None:
@@ -196,6 +211,14 @@ class RunOptions:
             metavar="TASK",
             help="exclude the entire subgraphs of one or more tasks",
         )
+        group.add_argument(
+            "-j",
+            "--jobs",
+            type=_jobs_type,
+            default=1,
+            metavar="N",
+            help="execute up to N independent tasks concurrently (default: %(default)s)",
+        )
 
     @classmethod
     def collect(cls, args: argparse.Namespace) -> RunOptions:
@@ -204,6 +227,7 @@ class RunOptions:
             allow_no_tasks=args.allow_no_tasks,
             exclude_tasks=args.exclude,
             exclude_tasks_subgraph=args.exclude_subgraph,
+            jobs=args.jobs,
         )
 
 
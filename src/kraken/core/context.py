@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import collections
+import contextlib
+import contextvars
 import dataclasses
 import enum
+import functools
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -23,12 +28,14 @@ from typing_extensions import TypeAlias
 
 from kraken.core.base import Currentable, MetadataContainer
 from kraken.core.executor import GraphExecutorObserver
+from kraken.core.executor.default import DefaultGraphExecutor, DefaultPrintingExecutorObserver, DefaultTaskExecutor
+from kraken.core.graph import TaskGraph
+from kraken.core.loader import PythonScriptProjectLoader
+from kraken.core.project import Project
 
 if TYPE_CHECKING:
     from kraken.core.executor import GraphExecutor
-    from kraken.core.graph import TaskGraph
     from kraken.core.loader import ProjectLoader
-    from kraken.core.project import Project
     from kraken.core.task import Task
 
 logger = logging.getLogger(__name__)
@@ -56,6 +63,19 @@ class ContextEvent:
     data: Any  # Depends on the event type
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_target(target: str) -> tuple[str, bool, tuple[str, ...]]:
+    """Internal. Parses a target string into the target without the optional `?` suffix, whether the target is
+    optional and the colon-separated parts of the target. The same targets are often resolved repeatedly, hence
+    the results are cached."""
+
+    optional = target.endswith("?")
+    if optional:
+        target = target[:-1]
+    # Project and task names are interned, interning the parts allows for identity comparisons in lookups.
+    return target, optional, tuple(sys.intern(part) for part in target.split(":"))
+
+
 class Context(MetadataContainer, Currentable["Context"]):
     """This class is the single instance where all components of a build process come together."""
 
@@ -74,13 +94,6 @@ class Context(MetadataContainer, Currentable["Context"]):
         :param observer: The executro observer to use when the graph is executed.
         """
 
-        from kraken.core.executor.default import (
-            DefaultGraphExecutor,
-            DefaultPrintingExecutorObserver,
-            DefaultTaskExecutor,
-        )
-        from kraken.core.loader import PythonScriptProjectLoader
-
         super().__init__()
         self.build_directory = build_directory
         self.project_loader = project_loader or PythonScriptProjectLoader()
@@ -90,6 +103,18 @@ class Context(MetadataContainer, Currentable["Context"]):
         self._root_project: Optional[Project] = None
         self._listeners: MutableMapping[ContextEvent.Type, list[ContextEvent.Listener]] = collections.defaultdict(list)
 
+        # The listeners to invoke per event type, including the listeners for any event. Reset by :meth:`listen`.
+        self._dispatch_cache: dict[ContextEvent.Type, tuple[ContextEvent.Listener, ...]] = {}
+
+        # Incremented whenever a project is added to the context to invalidate cached lookups.
+        self._projects_version = 0
+        self._projects_cache: tuple[int, list[Project]] | None = None
+
+        # Incremented whenever a task or project is added to the context to invalidate cached lookups.
+        self._tasks_version = 0
+        self._all_tasks_cache: tuple[tuple[int, int], list[Task]] | None = None
+        self._tasks_by_name_cache: tuple[tuple[int, int], dict[str, list[Task]]] | None = None
+
     @property
     def root_project(self) -> Project:
         assert self._root_project is not None, "Context.root_project is not set"
@@ -99,6 +124,7 @@ class Context(MetadataContainer, Currentable["Context"]):
     def root_project(self, project: Project) -> None:
         assert self._root_project is None, "Context.root_project is already set"
         self._root_project = project
+        self._bump_projects()
 
     def load_project(
         self,
@@ -115,13 +141,12 @@ class Context(MetadataContainer, Currentable["Context"]):
                 raised.
         """
 
-        from kraken.core.project import Project
-
         project = Project(directory.name, directory, parent, self)
         self.trigger(ContextEvent.Type.on_project_init, project)
         with self.as_current():
             if self._root_project is None:
                 self._root_project = project
+                self._bump_projects()
             self.project_loader.load_project(project)
         self.trigger(ContextEvent.Type.on_project_loaded, project)
         return project
@@ -129,12 +154,22 @@ class Context(MetadataContainer, Currentable["Context"]):
     def iter_projects(self) -> Iterator[Project]:
         """Iterates over all projects in the context."""
 
-        def _recurse(project: Project) -> Iterator[Project]:
-            yield project
-            for child_project in project.children().values():
-                yield from _recurse(child_project)
+        return iter(self.projects_list())
+
+    def projects_list(self) -> list[Project]:
+        """Returns a list of all projects in the context, in depth-first order. The list is cached until a project
+        is added to the context and must not be modified by the caller."""
 
-        yield from _recurse(self.root_project)
+        cache = self._projects_cache
+        if cache is None or cache[0] != self._projects_version:
+            projects: list[Project] = []
+            stack = [self.root_project]
+            while stack:
+                project = stack.pop()
+                projects.append(project)
+                stack.extend(reversed(list(project.children().values())))
+            cache = self._projects_cache = (self._projects_version, projects)
+        return cache[1]
 
     def resolve_tasks(self, targets: list[str] | None, relative_to: Project | None = None) -> list[Task]:
         """Resolve the given project or task references in *targets* relative to the specified project, or by
@@ -147,83 +182,92 @@ class Context(MetadataContainer, Currentable["Context"]):
         relative_to = relative_to or self.root_project
 
         if targets is None:
-            # Return all default tasks.
-            return [task for project in self.iter_projects() for task in project.tasks().values() if task.default]
+            # Return all default tasks. These are not cached because :attr:`Task.default` can change at any time.
+            return [task for task in self._get_all_tasks() if task.default]
 
-        tasks: list[Task] = []
-        count = 0
-        target: str
-
-        def _check_matched() -> None:
-            nonlocal count
-            if count == len(tasks):
-                raise ValueError(f"no tasks matched selector {target!r}")
-            count = len(tasks)
+        # A dictionary is used as an ordered set to avoid selecting the same task twice.
+        tasks: dict[Task, None] = {}
+        selected: Sequence[Task]
 
         for target in targets:
-            optional = target.endswith("?")
-            if optional:
-                target = target[:-1]
-            count = len(tasks)
+            target, optional, parts = _parse_target(target)
 
-            if ":" not in target:
+            if len(parts) == 1:
                 # Select all targets with a name matching the specified target.
-                tasks.extend(
-                    task for project in self.iter_projects() for task in project.tasks().values() if task.name == target
-                )
-                if not optional:
-                    _check_matched()
+                selected = self._get_tasks_by_name().get(target, ())
+                if not selected and not optional:
+                    raise ValueError(f"no tasks matched selector {target!r}")
+                tasks.update(dict.fromkeys(selected))
                 continue
 
             # Resolve as many components in the project hierarchy as possible.
             project = relative_to
-            parts = target.split(":")
+            index = 0
             if parts[0] == "":
                 project = self.root_project
-                parts.pop(0)
-            while parts:
-                project_children = project.children()
-                if parts[0] in project_children.values():
-                    project = project_children[parts.pop(0)]
-                else:
+                index = 1
+            while index < len(parts):
+                child_project = project.children().get(parts[index])
+                if child_project is None:
                     break
+                project = child_project
+                index += 1
+            remainder = parts[index:]
 
             project_tasks = project.tasks()
-            if not parts or parts == [""]:
+            if not remainder or remainder == ("",):
                 # The project was selected, add all default tasks.
-                tasks.extend(task for task in project_tasks.values() if task.default)
-            elif len(parts) == 1:
+                selected = [task for task in project_tasks.values() if task.default]
+                if not selected:
+                    raise ValueError(f"no tasks matched selector {target!r}")
+                tasks.update(dict.fromkeys(selected))
+            elif len(remainder) == 1:
                 # A specific target is selected.
-                if parts[0] not in project_tasks:
+                if remainder[0] not in project_tasks:
                     if optional:
                         continue
                     raise ValueError(f"task {target!r} does not exist")
-                tasks.append(project_tasks[parts[0]])
+                tasks[project_tasks[remainder[0]]] = None
             else:
                 # Some project in the path does not exist.
                 if optional:
                     continue
-                raise ValueError(f"project {':'.join(target.split(':')[:-1])} does not exist")
+                raise ValueError(f"project {':'.join(parts[:-1])} does not exist")
 
-            _check_matched()
+        return list(tasks)
 
-        return tasks
+    def finalize(self, parallel: bool = False) -> None:
+        """Call :meth:`Task.finalize()` on all tasks. This should be called before a graph is created.
 
-    def finalize(self) -> None:
-        """Call :meth:`Task.finalize()` on all tasks. This should be called before a graph is created."""
+        :param parallel: Finalize the tasks of each project concurrently in a thread pool. This is useful if
+            the finalization of tasks involves I/O, but requires that :meth:`Task.finalize` implementations
+            are thread safe with respect to other tasks. Projects are still finalized one after another."""
 
         if self._finalized:
             logger.warning("Context.finalize() called more than once", stack_info=True)
             return
 
         self._finalized = True
-        self.trigger(ContextEvent.Type.on_context_begin_finalize, self)
-        for project in self.iter_projects():
-            self.trigger(ContextEvent.Type.on_project_begin_finalize, project)
-            for task in project.tasks().values():
-                task.finalize()
-            self.trigger(ContextEvent.Type.on_project_finalized, project)
-        self.trigger(ContextEvent.Type.on_context_finalized, self)
+
+        with contextlib.ExitStack() as exit_stack:
+            pool = exit_stack.enter_context(ThreadPoolExecutor()) if parallel else None
+            self.trigger(ContextEvent.Type.on_context_begin_finalize, self)
+
+            for project in self.projects_list():
+                self.trigger(ContextEvent.Type.on_project_begin_finalize, project)
+                if pool is None:
+                    for task in project.tasks().values():
+                        task.finalize()
+                else:
+                    # Run each task in a copy of the current context to keep access to the current objects, and
+                    # consume the results to propagate exceptions raised by Task.finalize().
+                    futures = [
+                        pool.submit(contextvars.copy_context().run, task.finalize) for task in project.tasks().values()
+                    ]
+                    for future in futures:
+                        future.result()
+                self.trigger(ContextEvent.Type.on_project_finalized, project)
+            self.trigger(ContextEvent.Type.on_context_finalized, self)
 
     def get_build_graph(self, targets: Sequence[str | Task] | None) -> TaskGraph:
         """Returns the :class:`TaskGraph` that contains either all default tasks or the tasks specified with
@@ -233,18 +277,25 @@ class Context(MetadataContainer, Currentable["Context"]):
         :raise ValueError: If not tasks were selected.
         """
 
-        from kraken.core.graph import TaskGraph
-
         if targets is None:
             tasks = self.resolve_tasks(None)
+        elif not targets:
+            raise ValueError("no tasks selected")
         else:
-            tasks = self.resolve_tasks([t for t in targets if isinstance(t, str)]) + [
-                t for t in targets if not isinstance(t, str)
-            ]
+            selectors: list[str] = []
+            explicit_tasks: list[Task] = []
+            for target in targets:
+                if isinstance(target, str):
+                    selectors.append(target)
+                else:
+                    explicit_tasks.append(target)
+            tasks = self.resolve_tasks(selectors) + explicit_tasks
 
         if not tasks:
             raise ValueError("no tasks selected")
 
+        # NOTE: The full graph is not cached, as relationships between tasks can change at any time, e.g. when a
+        #       property is set to the output of another task.
         graph = TaskGraph(self).trim(tasks)
 
         assert graph, "TaskGraph cannot be empty"
@@ -260,8 +311,6 @@ class Context(MetadataContainer, Currentable["Context"]):
         :raise BuildError: If any task fails to execute.
         """
 
-        from kraken.core.graph import TaskGraph
-
         if isinstance(tasks, TaskGraph):
             assert self._finalized, "no, no, this is all wrong. you need to finalize the context first"
             graph = tasks
@@ -273,12 +322,7 @@ class Context(MetadataContainer, Currentable["Context"]):
         self.executor.execute_graph(graph, self.observer)
 
         if not graph.is_complete():
-            failed_tasks = list(graph.tasks(failed=True))
-            if len(failed_tasks) == 1:
-                message = f'task "{failed_tasks[0].path}" failed'
-            else:
-                message = "tasks " + ", ".join(f'"{task.path}"' for task in failed_tasks) + " failed"
-            raise BuildError(message)
+            raise BuildError(task.path for task in graph.tasks(failed=True))
 
     @overload
     def listen(
@@ -299,6 +343,7 @@ class Context(MetadataContainer, Currentable["Context"]):
         def register(listener: ContextEvent.T_Listener) -> ContextEvent.T_Listener:
             assert callable(listener), "listener must be callable, got: %r" % listener
             self._listeners[event_type].append(listener)
+            self._dispatch_cache.clear()
             return listener
 
         if listener is None:
@@ -306,21 +351,71 @@ class Context(MetadataContainer, Currentable["Context"]):
 
         register(listener)
 
+    def _get_all_tasks(self) -> list[Task]:
+        """Internal. Returns a list of all tasks in the context, in the order of :meth:`projects_list`."""
+
+        key = (self._projects_version, self._tasks_version)
+        cache = self._all_tasks_cache
+        if cache is None or cache[0] != key:
+            tasks = [task for project in self.projects_list() for task in project.tasks().values()]
+            cache = self._all_tasks_cache = (key, tasks)
+        return cache[1]
+
+    def _get_tasks_by_name(self) -> dict[str, list[Task]]:
+        """Internal. Returns a mapping of all task names in the context to the tasks with that name."""
+
+        key = (self._projects_version, self._tasks_version)
+        cache = self._tasks_by_name_cache
+        if cache is None or cache[0] != key:
+            index: dict[str, list[Task]] = {}
+            for task in self._get_all_tasks():
+                index.setdefault(task.name, []).append(task)
+            cache = self._tasks_by_name_cache = (key, index)
+        return cache[1]
+
+    def _bump_projects(self) -> None:
+        """Internal. Called when a project is added to the context."""
+
+        self._projects_version += 1
+
+    def _bump_tasks(self) -> None:
+        """Internal. Called by :class:`Project` when a task or child project is added to the context."""
+
+        self._tasks_version += 1
+
+    def _get_listeners(self, event_type: ContextEvent.Type) -> tuple[ContextEvent.Listener, ...]:
+        """Internal. Returns the listeners to invoke for an event of the given type."""
+
+        listeners = self._dispatch_cache.get(event_type)
+        if listeners is None:
+            listeners = (*self._listeners.get(ContextEvent.Type.any, ()), *self._listeners.get(event_type, ()))
+            self._dispatch_cache[event_type] = listeners
+        return listeners
+
     def trigger(self, event_type: ContextEvent.Type, data: Any) -> None:
         assert isinstance(event_type, ContextEvent.Type), repr(event_type)
         assert event_type != ContextEvent.Type.any, "cannot trigger event of type 'any'"
-        listeners = (*self._listeners.get(ContextEvent.Type.any, ()), *self._listeners.get(event_type, ()))
+        listeners = self._get_listeners(event_type)
+        if not listeners:
+            return
+        event = ContextEvent(event_type, data)
         for listener in listeners:
             # TODO(NiklasRosenstein): Should we catch errors in listeners of letting them propagate?
-            listener(ContextEvent(event_type, data))
+            listener(event)
 
 
 class BuildError(Exception):
     def __init__(self, failed_tasks: Iterable[str]) -> None:
         self.failed_tasks = set(failed_tasks)
+        self.sorted_failed_tasks = tuple(sorted(self.failed_tasks))
+        if len(self.sorted_failed_tasks) == 1:
+            self._message = f'task "{self.sorted_failed_tasks[0]}" failed'
+        else:
+            self._message = "tasks " + ", ".join(f'"{task}"' for task in self.sorted_failed_tasks) + " failed"
+        super().__init__(self.sorted_failed_tasks)
+
+    def __str__(self) -> str:
+        return self._message
 
     def __repr__(self) -> str:
-        if len(self.failed_tasks) == 1:
-            return f'task "{next(iter(self.failed_tasks))}" failed'
-        else:
-            return "tasks " + ", ".join(f'"{task}"' for task in sorted(self.failed_tasks)) + " failed"
+        return self._message
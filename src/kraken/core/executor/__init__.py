@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import abc
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
     from kraken.core.task import Task, TaskStatus
@@ -30,6 +30,13 @@ class Graph(abc.ABC):
         """Set the result of a task. Can be called twice for the same task unless the previous call was passing
         a status with type :attr:`TaskStatusType.STARTED`."""
 
+    def set_statuses(self, statuses: Iterable[tuple[Task, TaskStatus]]) -> None:
+        """Set the results of multiple tasks at once. The default implementation calls :meth:`set_status` for each
+        task, but implementations may override this method to update the graph in a single step."""
+
+        for task, status in statuses:
+            self.set_status(task, status)
+
     @abc.abstractmethod
     def is_complete(self) -> bool:
         """Return `True` if all tasks in the graph are done and successful."""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from typing import Collection
 
 from termcolor import colored as _colored
@@ -19,9 +20,14 @@ COLORS_BY_STATUS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _colored_status_type(status_type: TaskStatusType) -> str:
+    return _colored(status_type.name, COLORS_BY_STATUS.get(status_type))
+
+
 def status_to_text(status: TaskStatus, colored: bool = True) -> str:
     if colored:
-        message = _colored(status.type.name, COLORS_BY_STATUS.get(status.type))
+        message = _colored_status_type(status.type)
     else:
         message = status.type.name
     if status.message:
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import abc
+import contextlib
+import contextvars
+import queue
 import sys
-import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from typing import Callable, Iterable
 
@@ -48,10 +51,44 @@ class DefaultTaskExecutor(TaskExecutor):
 
 
 class DefaultGraphExecutor(GraphExecutor):
-    """The most straight forward graph executor."""
+    """The most straight forward graph executor.
 
-    def __init__(self, task_executor: TaskExecutor) -> None:
+    :param task_executor: The executor for individual tasks.
+    :param max_workers: The maximum number of tasks to execute concurrently. If greater than one, tasks are
+        executed in a thread pool. Tasks are still prepared, and the observer is still notified, from the
+        thread that called :meth:`execute_graph`; only :meth:`TaskExecutor.execute_task` is called from the
+        worker threads. Note that the output of tasks that run concurrently may be interleaved."""
+
+    def __init__(self, task_executor: TaskExecutor, max_workers: int = 1) -> None:
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
         self._task_executor = task_executor
+        self._max_workers = max_workers
+
+    @property
+    def task_executor(self) -> TaskExecutor:
+        return self._task_executor
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def _execute_task_in_worker(
+        self, task: Task, completed: queue.Queue[tuple[Task, TaskStatus | BaseException]]
+    ) -> None:
+        reported = False
+
+        def done(status: TaskStatus) -> None:
+            nonlocal reported
+            reported = True
+            completed.put((task, status))
+
+        try:
+            self._task_executor.execute_task(task, done)
+        except BaseException as exc:
+            if reported:
+                raise
+            completed.put((task, exc))
 
     def execute_graph(self, graph: Graph, observer: GraphExecutorObserver) -> None:
 
@@ -77,8 +114,11 @@ class DefaultGraphExecutor(GraphExecutor):
                 self._task_executor.teardown_task(task, partial(teardown_done, task))
 
         def execute_done(task: Task, status: TaskStatus) -> None:
-            nonlocal interrupted
             graph.set_status(task, status)
+            after_execute(task, status)
+
+        def after_execute(task: Task, status: TaskStatus) -> None:
+            nonlocal interrupted
             observer.after_execute_task(task, status)
             if status.is_started():
                 # NOTE (@NiklasRosenstein): (untested hyopthesis) If we do not call remember.done(task) here, it means
@@ -98,14 +138,83 @@ class DefaultGraphExecutor(GraphExecutor):
             observer.after_teardown_task(task, status)
             invoke_teardown(remember.done(task))
 
+        def execute_concurrently(pool: ThreadPoolExecutor) -> None:
+            # The worker threads only execute tasks and report the result through this queue. Everything else,
+            # including updates to the graph and calls to the observer, happens in the current thread.
+            completed: queue.Queue[tuple[Task, TaskStatus | BaseException]] = queue.Queue()
+            submitted: set[Task] = set()
+            running = 0
+
+            try:
+                while True:
+                    # Only hand as many tasks to the pool as there are workers, such that no tasks are left queued in
+                    # the pool (and executed when it shuts down) if the build is interrupted or fails.
+                    progressed = False
+                    for task in [] if interrupted else graph.ready():
+                        if running >= self._max_workers or interrupted:
+                            break
+                        if task in submitted:
+                            continue
+                        submitted.add(task)
+                        observer.before_prepare_task(task)
+                        status = task.prepare() or TaskStatus.pending()
+                        observer.after_prepare_task(task, status)
+                        if status.is_pending():
+                            observer.before_execute_task(task, status)
+                            running += 1
+                            # Run the task in a copy of the current context to keep access to the current objects.
+                            pool.submit(contextvars.copy_context().run, self._execute_task_in_worker, task, completed)
+                        else:
+                            execute_done(task, status)
+                            progressed = True
+
+                    # Tasks that were not executed may have made other tasks ready.
+                    if progressed:
+                        continue
+
+                    if not running:
+                        break
+
+                    # Wait for at least one task to complete, then take all other results that are available as well.
+                    results = [completed.get()]
+                    with contextlib.suppress(queue.Empty):
+                        while True:
+                            results.append(completed.get_nowait())
+                    running -= len(results)
+
+                    statuses: list[tuple[Task, TaskStatus]] = []
+                    errors: list[BaseException] = []
+                    for task, result in results:
+                        if isinstance(result, BaseException):
+                            errors.append(result)
+                        else:
+                            statuses.append((task, result))
+                    graph.set_statuses(statuses)
+                    for task, status in statuses:
+                        after_execute(task, status)
+                    if errors:
+                        raise errors[0]
+            except BaseException:
+                # The pool waits for the running tasks before it shuts down, report their results when they come in.
+                while running:
+                    task, result = completed.get()
+                    running -= 1
+                    if not isinstance(result, BaseException):
+                        execute_done(task, result)
+                raise
+
         observer.before_execute_graph(graph)
 
         try:
-            while not graph.is_complete() and not interrupted:
-                tasks = graph.ready()
-                if not tasks:
-                    break
-                invoke_execute(tasks)
+            if self._max_workers > 1:
+                with ThreadPoolExecutor(self._max_workers) as pool:
+                    execute_concurrently(pool)
+            else:
+                while not graph.is_complete() and not interrupted:
+                    tasks = graph.ready()
+                    if not tasks:
+                        break
+                    invoke_execute(tasks)
         finally:
             invoke_teardown(remember.forget_all())
             observer.after_execute_graph(graph)
@@ -127,7 +236,6 @@ class DefaultPrintingExecutorObserver(GraphExecutorObserver):
         self.status_to_text = status_to_text or self.default_status_to_text
         self.format_header = format_header or str
         self.format_duration = format_duration or str
-        self._lock = threading.Lock()
         self._status: dict[str, TaskStatus] = {}
         self._started: dict[str, float] = {}
         self._duration: dict[str, float] = {}
@@ -135,24 +243,28 @@ class DefaultPrintingExecutorObserver(GraphExecutorObserver):
     def _ask_report_task_status(self, task: Task, status: TaskStatus) -> bool:
         return not (isinstance(task, (GroupTask, VoidTask)) and status.is_skipped())
 
+    def _write(self, *lines: str) -> None:
+        """Write the lines to stdout and flush once. Flushing is needed to keep the output in order with the
+        output of tasks, but each flush is a separate write to the terminal."""
+
+        sys.stdout.write("".join(line + "\n" for line in lines))
+        sys.stdout.flush()
+
     def before_execute_graph(self, graph: Graph) -> None:
-        print(flush=True)
-        print(self.format_header("Start build"), flush=True)
-        print(flush=True)
+        self._write("", self.format_header("Start build"), "")
 
     def after_execute_graph(self, graph: Graph) -> None:
-        print(flush=True)
-        print(self.format_header("Build summary"), flush=True)
-        print(flush=True)
+        lines = ["", self.format_header("Build summary"), ""]
+        indent = " " * (len(self.execute_prefix) + 1)
         for task_path, status in self._status.items():
             task = graph.get_task(task_path)
             if self._ask_report_task_status(task, status):
-                print(
-                    " " * (len(self.execute_prefix) + 1) + task_path,
-                    self.status_to_text(status),
-                    self.format_duration(f"[{self._duration[task_path]:.3f}s]") if task_path in self._duration else "",
+                duration = (
+                    self.format_duration(f"[{self._duration[task_path]:.3f}s]") if task_path in self._duration else ""
                 )
-        print(flush=True)
+                lines.append(f"{indent}{task_path} {self.status_to_text(status)} {duration}")
+        lines.append("")
+        self._write(*lines)
 
     def default_status_to_text(self, status: TaskStatus) -> str:
         if status.message:
@@ -161,9 +273,8 @@ class DefaultPrintingExecutorObserver(GraphExecutorObserver):
             return status.type.name
 
     def before_execute_task(self, task: Task, status: TaskStatus) -> None:
-        print(self.execute_prefix, task.path, self.status_to_text(status), flush=True)
-        with self._lock:
-            self._started[task.path] = time.perf_counter()
+        self._write(f"{self.execute_prefix} {task.path} {self.status_to_text(status)}")
+        self._started[task.path] = time.perf_counter()
 
     def on_task_output(self, task: Task, chunk: bytes) -> None:
         sys.stdout.buffer.write(chunk)
@@ -171,16 +282,14 @@ class DefaultPrintingExecutorObserver(GraphExecutorObserver):
 
     def after_execute_task(self, task: Task, status: TaskStatus) -> None:
         if self._ask_report_task_status(task, status):
-            print(self.execute_prefix, task.path, self.status_to_text(status), flush=True)
-        with self._lock:
-            self._status[task.path] = status
-            if task.path in self._started:
-                self._duration[task.path] = time.perf_counter() - self._started[task.path]
+            self._write(f"{self.execute_prefix} {task.path} {self.status_to_text(status)}")
+        self._status[task.path] = status
+        if task.path in self._started:
+            self._duration[task.path] = time.perf_counter() - self._started[task.path]
 
     def before_teardown_task(self, task: Task) -> None:
-        print(self.teardown_prefix, task.path, flush=True)
+        self._write(f"{self.teardown_prefix} {task.path}")
 
     def after_teardown_task(self, task: Task, status: TaskStatus) -> None:
-        print(self.teardown_prefix, task.path, self.status_to_text(status), flush=True)
-        with self._lock:
-            self._status[task.path] = status
+        self._write(f"{self.teardown_prefix} {task.path} {self.status_to_text(status)}")
+        self._status[task.path] = status
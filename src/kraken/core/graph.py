@@ -1,21 +1,29 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
 import logging
-from typing import Iterable, Iterator, List, Sequence, cast
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Sequence
 
-from networkx import DiGraph, restricted_view, transitive_reduction
-
-from kraken.core.context import Context
 from kraken.core.executor import Graph
 from kraken.core.task import GroupTask, Task, TaskStatus
 from kraken.core.util.helpers import not_none
 
+if TYPE_CHECKING:
+    from kraken.core.context import Context
+
 logger = logging.getLogger(__name__)
 
 
+# The flags of an edge in the graph are stored as an integer to avoid an object per edge.
+_STRICT = 1
+_IMPLICIT = 2
+
+
 @dataclasses.dataclass
 class _Edge:
+    __slots__ = ("strict", "implicit")
+
     strict: bool
     implicit: bool
 
@@ -37,8 +45,12 @@ class TaskGraph(Graph):
         self._parent = parent
         self._context = context
 
-        # Nodes have the form {'data': _Node} and edges have the form {'data': _Edge}.
-        self._digraph = DiGraph()
+        # Maps task paths to the tasks in the graph, and each task path to the edges from its predecessors
+        # and to its successors. Edges are represented by their flags (a combination of `_STRICT` and `_IMPLICIT`),
+        # which must be kept in sync between the two adjacency mappings.
+        self._tasks: dict[str, Task] = {}
+        self._predecessors: dict[str, dict[str, int]] = {}
+        self._successors: dict[str, dict[str, int]] = {}
 
         # Keep track of task execution results.
         self._results: dict[str, TaskStatus] = {}
@@ -51,49 +63,82 @@ class TaskGraph(Graph):
         # reset so they start again if another task requires them.
         self._background_tasks: set[str] = set()
 
+        # The number of predecessors of each task that are not completed, the tasks without a result of which all
+        # predecessors are completed, and the position of each task in the graph to return ready tasks in a stable
+        # order. Updated by :meth:`set_status` and computed from scratch by :meth:`ready` after any other change to
+        # the graph (indicated by `None`).
+        self._pending_predecessors: dict[str, int] | None = None
+        self._ready_tasks: set[str] | None = None
+        self._positions: dict[str, int] = {}
+
+        # The number of tasks in the graph that are not completed. Like the ready tasks, this is updated by
+        # :meth:`set_status` and computed from scratch by :meth:`is_complete` after any other change.
+        self._incomplete_count: int | None = None
+
+        # The topological order of all task paths in the graph, computed when needed after a change to the
+        # structure of the graph (indicated by `None`).
+        self._topological_order_cache: tuple[str, ...] | None = None
+
         if populate:
             self.populate()
 
     def __bool__(self) -> bool:
-        return len(self._digraph.nodes) > 0
+        return len(self._tasks) > 0
 
     def __len__(self) -> int:
-        return len(self._digraph.nodes)
+        return len(self._tasks)
 
     # Low level internal API
 
     def _get_task(self, task_path: str) -> Task | None:
-        data = self._digraph.nodes.get(task_path)
-        if data is None:
-            return None
-        try:
-            return cast(Task, data["data"])
-        except KeyError:
-            raise RuntimeError(f"An unexpected error occurred when fetching the task by address {task_path!r}.")
+        return self._tasks.get(task_path)
+
+    def _add_node(self, task: Task) -> None:
+        self._invalidate_ready()
+        self._tasks[task.path] = task
+        self._predecessors[task.path] = {}
+        self._successors[task.path] = {}
 
     def _add_task(self, task: Task) -> None:
-        self._digraph.add_node(task.path, data=task)
-        for rel in task.get_relationships():
-            if rel.other_task.path not in self._digraph.nodes:
-                self._add_task(rel.other_task)
+        # The tasks are added depth-first without recursion, such that long dependency chains do not exceed the
+        # recursion limit. Each generator on the stack yields the tasks that must be added before it can continue.
+        stack = [self._add_task_and_edges(task)]
+        while stack:
+            other_task = next(stack[-1], None)
+            if other_task is None:
+                stack.pop()
+            elif other_task.path not in self._tasks:
+                stack.append(self._add_task_and_edges(other_task))
+
+    def _add_task_and_edges(self, task: Task) -> Iterator[Task]:
+        """Internal. Adds the task and the edges to the tasks it is related to. Tasks that are not yet in the graph
+        are yielded and must be added before the generator is resumed."""
+
+        self._add_node(task)
+
+        # Resolving relationships may resolve task selectors through the context, so we do it only once per task.
+        group_members = set(task.tasks) if isinstance(task, GroupTask) else set()
+        for rel in list(task.get_relationships()):
+            if rel.other_task.path not in self._tasks:
+                yield rel.other_task
             a, b = (task, rel.other_task) if rel.inverse else (rel.other_task, task)
             self._add_edge(a.path, b.path, rel.strict, False)
 
             # If this relationship is one implied through group membership, we're done.
-            if isinstance(task, GroupTask) and not rel.inverse and rel.other_task in task.tasks:
+            if not rel.inverse and rel.other_task in group_members:
                 continue
 
             # When a group depends on some other task, we implicitly make each member of that downstream group
             # depend on the upstream task. If we find another group, we unpack the group further.
             upstream, downstream = (task, rel.other_task) if rel.inverse else (rel.other_task, task)
             if isinstance(downstream, GroupTask):
-                downstream_tasks = list(downstream.tasks)
+                downstream_tasks = collections.deque(downstream.tasks)
                 while downstream_tasks:
-                    member = downstream_tasks.pop(0)
-                    if member.path not in self._digraph.nodes:
-                        self._add_task(member)
+                    member = downstream_tasks.popleft()
+                    if member.path not in self._tasks:
+                        yield member
                     if isinstance(member, GroupTask):
-                        downstream_tasks += member.tasks
+                        downstream_tasks.extend(member.tasks)
                         continue
 
                     # NOTE(niklas.rosenstein): When a group is nested in another group, we would end up declaring
@@ -101,60 +146,125 @@ class TaskGraph(Graph):
                     if upstream != member:
                         self._add_edge(upstream.path, member.path, rel.strict, True)
 
-    def _get_edge(self, task_a: str, task_b: str) -> _Edge | None:
-        data = self._digraph.edges.get((task_a, task_b)) or self._digraph.edges.get((task_a, task_b))
-        if data is None:
-            return None
-        return cast(_Edge, data["data"])
+    def _get_edge(self, task_a: str, task_b: str) -> int | None:
+        successors = self._successors.get(task_a)
+        return None if successors is None else successors.get(task_b)
+
+    def _set_edge(self, task_a: str, task_b: str, flags: int) -> None:
+        if task_b not in self._successors[task_a]:
+            self._invalidate_ready()
+        self._successors[task_a][task_b] = flags
+        self._predecessors[task_b][task_a] = flags
 
     def _add_edge(self, task_a: str, task_b: str, strict: bool, implicit: bool) -> None:
-        # add_edge() would implicitly add a node, we only want to do that once the node actually exists in
-        # the graph though.
-        assert task_a in self._digraph.nodes, f"{task_a!r} not yet in the graph"
-        assert task_b in self._digraph.nodes, f"{task_b!r} not yet in the graph"
-        edge = self._get_edge(task_a, task_b) or _Edge(strict, implicit)
-        edge.strict = edge.strict or strict
-        edge.implicit = edge.implicit and implicit
-        self._digraph.add_edge(task_a, task_b, data=edge)
+        # Edges can only be added between nodes that already exist in the graph.
+        assert task_a in self._tasks, f"{task_a!r} not yet in the graph"
+        assert task_b in self._tasks, f"{task_b!r} not yet in the graph"
+        flags = (_STRICT if strict else 0) | (_IMPLICIT if implicit else 0)
+        current_flags = self._get_edge(task_a, task_b)
+        if current_flags is not None:
+            # The edge is strict if any of the relationships is strict, and implicit only if all of them are.
+            flags = ((current_flags | flags) & _STRICT) | (current_flags & flags & _IMPLICIT)
+        self._set_edge(task_a, task_b, flags)
+
+    def _remove_node(self, task_path: str) -> None:
+        self._invalidate_ready()
+        del self._tasks[task_path]
+        for pred in self._predecessors.pop(task_path):
+            del self._successors[pred][task_path]
+        for succ in self._successors.pop(task_path):
+            del self._predecessors[succ][task_path]
+
+    def _invalidate_ready(self) -> None:
+        self._topological_order_cache = None
+        self._pending_predecessors = None
+        self._ready_tasks = None
+        self._incomplete_count = None
+
+    def _topological_order(self) -> Iterator[str]:
+        """Internal. Yields the task paths in topological order, one generation after another. Raises a
+        :class:`RuntimeError` if the graph contains a cycle."""
+
+        indegree: dict[str, int] = {}
+        generation: list[str] = []
+        for task_path, predecessors in self._predecessors.items():
+            if predecessors:
+                indegree[task_path] = len(predecessors)
+            else:
+                generation.append(task_path)
+
+        while generation:
+            next_generation = []
+            for task_path in generation:
+                for succ in self._successors[task_path]:
+                    indegree[succ] -= 1
+                    if indegree[succ] == 0:
+                        next_generation.append(succ)
+                        del indegree[succ]
+            yield from generation
+            generation = next_generation
+
+        if indegree:
+            raise RuntimeError(f"the task graph contains a cycle: {', '.join(indegree)}")
 
     # High level internal API
 
     def _get_required_tasks(self, goals: Iterable[Task]) -> set[str]:
         """Internal. Return the set of tasks that are required transitively from the goal tasks."""
 
-        def _recurse_task(task_path: str, visited: set[str], path: list[str]) -> None:
-            if task_path in path:
-                raise RuntimeError(f"encountered a dependency cycle: {' → '.join(path)}")
-            visited.add(task_path)
-            for pred in self._digraph.predecessors(task_path):
-                if not_none(self._get_edge(pred, task_path)).strict:
-                    _recurse_task(pred, visited, path + [task_path])
+        def strict_predecessors(task_path: str) -> Iterator[str]:
+            return (pred for pred, flags in self._predecessors[task_path].items() if flags & _STRICT)
 
+        # Iterative depth-first search. The current path is tracked to detect dependency cycles.
         active_tasks: set[str] = set()
         for task in goals:
-            _recurse_task(task.path, active_tasks, [])
+            if task.path in active_tasks:
+                continue
+            active_tasks.add(task.path)
+            path = [task.path]
+            on_path = {task.path}
+            stack = [strict_predecessors(task.path)]
+            while stack:
+                pred = next(stack[-1], None)
+                if pred is None:
+                    stack.pop()
+                    on_path.discard(path.pop())
+                elif pred in on_path:
+                    raise RuntimeError(f"encountered a dependency cycle: {' → '.join(path)}")
+                elif pred not in active_tasks:
+                    active_tasks.add(pred)
+                    path.append(pred)
+                    on_path.add(pred)
+                    stack.append(strict_predecessors(pred))
 
         return active_tasks
 
+    @staticmethod
+    def _get_reachable_tasks(tasks: Iterable[str], adjacency: dict[str, dict[str, int]]) -> set[str]:
+        """Internal. Return the set of tasks reachable from *tasks* (inclusive) through the *adjacency* mapping."""
+
+        reachable = set(tasks)
+        stack = list(reachable)
+        while stack:
+            for task_path in adjacency[stack.pop()]:
+                if task_path not in reachable:
+                    reachable.add(task_path)
+                    stack.append(task_path)
+        return reachable
+
     def _remove_nodes_keep_transitive_edges(self, nodes: Iterable[str]) -> None:
         """Internal. Remove nodes from the graph, but ensure that transitive dependencies are kept in tact."""
 
         for task_path in nodes:
-            for in_task_path in self._digraph.predecessors(task_path):
-                in_edge = not_none(self._get_edge(in_task_path, task_path))
-                for out_task_path in self._digraph.successors(task_path):
-                    out_edge = not_none(self._get_edge(task_path, out_task_path))
+            for in_task_path, in_flags in self._predecessors[task_path].items():
+                for out_task_path, out_flags in self._successors[task_path].items():
                     self._add_edge(
                         in_task_path,
                         out_task_path,
-                        strict=in_edge.strict or out_edge.strict,
-                        implicit=in_edge.implicit and out_edge.implicit,
+                        strict=bool((in_flags | out_flags) & _STRICT),
+                        implicit=bool(in_flags & out_flags & _IMPLICIT),
                     )
-            self._digraph.remove_node(task_path)
-
-    def _get_ready_graph(self) -> DiGraph:
-        """Updates the ready graph."""
-        return restricted_view(self._digraph, self._completed_tasks, set())
+            self._remove_node(task_path)
 
     # Public API
 
@@ -173,13 +283,14 @@ class TaskGraph(Graph):
         return self
 
     def get_edge(self, pred: Task, succ: Task) -> _Edge:
-        return not_none(self._get_edge(pred.path, succ.path), f"edge does not exist ({pred.path} --> {succ.path})")
+        flags = not_none(self._get_edge(pred.path, succ.path), f"edge does not exist ({pred.path} --> {succ.path})")
+        return _Edge(bool(flags & _STRICT), bool(flags & _IMPLICIT))
 
     def get_predecessors(self, task: Task, ignore_groups: bool = False) -> List[Task]:
         """Returns the predecessors of the task in the original full build graph."""
 
         result = []
-        for task in (not_none(self._get_task(task_path)) for task_path in self._digraph.predecessors(task.path)):
+        for task in (self._tasks[task_path] for task_path in self._predecessors[task.path]):
             if ignore_groups and isinstance(task, GroupTask):
                 result += task.tasks
             else:
@@ -203,21 +314,37 @@ class TaskGraph(Graph):
         """
 
         if goals is None:
-            for project in self.context.iter_projects():
-                for task in project.tasks().values():
-                    if task.path not in self._digraph.nodes:
-                        self._add_task(task)
+            for task in self.context._get_all_tasks():
+                if task.path not in self._tasks:
+                    self._add_task(task)
         else:
             for task in goals:
-                if task.path not in self._digraph.nodes:
+                if task.path not in self._tasks:
                     self._add_task(task)
 
     def trim(self, goals: Sequence[Task]) -> TaskGraph:
         """Returns a copy of the graph that is trimmed to execute only *goals* and their strict dependencies."""
 
-        graph = TaskGraph(self.context, parent=self)
-        unrequired_tasks = set(graph._digraph.nodes) - graph._get_required_tasks(goals)
-        graph._remove_nodes_keep_transitive_edges(unrequired_tasks)
+        # Tasks that are not required are removed, but transitive edges between required tasks must be kept in
+        # tact. Only the tasks that lie on a path between two required tasks can contribute such an edge, all other
+        # tasks can be dropped right away.
+        required_tasks = self._get_required_tasks(goals)
+        intermediate_tasks = (
+            self._get_reachable_tasks(required_tasks, self._successors)
+            & self._get_reachable_tasks(required_tasks, self._predecessors)
+        ) - required_tasks
+        keep_tasks = required_tasks | intermediate_tasks
+
+        # Copy the structure of this graph instead of populating the new graph from the context again.
+        graph = TaskGraph(self.context, populate=False, parent=self)
+        for task_path, task in self._tasks.items():
+            if task_path in keep_tasks:
+                graph._add_node(task)
+        for task_a in graph._tasks:
+            for task_b, flags in self._successors[task_a].items():
+                if task_b in keep_tasks:
+                    graph._set_edge(task_a, task_b, flags)
+        graph._remove_nodes_keep_transitive_edges(intermediate_tasks)
         return graph
 
     def reduce(self, keep_explicit: bool = False) -> TaskGraph:
@@ -225,17 +352,22 @@ class TaskGraph(Graph):
 
         :param keep_explicit: Keep non-implicit edges in tact."""
 
-        digraph = self._digraph
-        reduced_graph = transitive_reduction(digraph)
-        reduced_graph.add_nodes_from(digraph.nodes(data=True))
-        reduced_graph.add_edges_from(
-            (u, v, digraph.edges[u, v])
-            for u, v in digraph.edges
-            if (keep_explicit and not digraph.edges[u, v]["data"].implicit) or (u, v) in reduced_graph.edges
-        )
-
+        # Visit the tasks in reverse topological order so that the tasks reachable from every successor are known.
+        # An edge is redundant if its target can also be reached through another successor.
+        descendants: dict[str, set[str]] = {}
         graph = TaskGraph(self.context, populate=False, parent=self)
-        graph._digraph = reduced_graph
+        for task in self._tasks.values():
+            graph._add_node(task)
+        for u in reversed(list(self._topological_order())):
+            successors = self._successors[u]
+            indirect_descendants: set[str] = set()
+            for v in successors:
+                indirect_descendants |= descendants[v]
+            for v, flags in successors.items():
+                if (keep_explicit and not flags & _IMPLICIT) or v not in indirect_descendants:
+                    graph._set_edge(u, v, flags)
+            indirect_descendants.update(successors)
+            descendants[u] = indirect_descendants
         graph.results_from(self)
 
         return graph
@@ -271,6 +403,7 @@ class TaskGraph(Graph):
                     reset_tasks.add(pred.path)
 
         if reset_tasks:
+            self._invalidate_ready()
             logger.info("Reset the status of %d background task(s): %s", len(reset_tasks), " ".join(reset_tasks))
 
     def restart(self) -> None:
@@ -279,6 +412,7 @@ class TaskGraph(Graph):
         self._results.clear()
         self._completed_tasks.clear()
         self._background_tasks.clear()
+        self._invalidate_ready()
 
     def tasks(
         self,
@@ -293,9 +427,9 @@ class TaskGraph(Graph):
         :param failed: Return only failed tasks.
         :param all: Return from all tasks, not just from the tasks that need to be executed."""
 
-        tasks = (not_none(self._get_task(task_path)) for task_path in self._digraph)
+        tasks: Iterator[Task] = iter(self._tasks.values())
         if goals:
-            tasks = (t for t in tasks if self._digraph.out_degree(t.path) == 0)
+            tasks = (t for t in tasks if not self._successors[t.path])
         if pending:
             tasks = (t for t in tasks if t.path not in self._results)
         if failed:
@@ -307,10 +441,12 @@ class TaskGraph(Graph):
 
         :param all: Return the execution order of all tasks, not just from the target subgraph."""
 
-        from networkx.algorithms import topological_sort
-
-        order = topological_sort(self._digraph if all else self._get_ready_graph())
-        return (not_none(self._get_task(task_path)) for task_path in order)
+        if self._topological_order_cache is None:
+            self._topological_order_cache = tuple(self._topological_order())
+        order: Iterable[str] = self._topological_order_cache
+        if not all:
+            order = (task_path for task_path in order if task_path not in self._completed_tasks)
+        return (self._tasks[task_path] for task_path in order)
 
     # Graph
 
@@ -320,11 +456,21 @@ class TaskGraph(Graph):
         returned if no tasks are ready. At this point, if no tasks are currently running, :meth:`is_complete` can be
         used to check if the entire task graph was executed successfully."""
 
-        ready_graph = self._get_ready_graph()
-        root_set = (
-            node for node in ready_graph.nodes if ready_graph.in_degree(node) == 0 and node not in self._results
-        )
-        return [not_none(self._get_task(task_path)) for task_path in root_set]
+        if self._pending_predecessors is None or self._ready_tasks is None:
+            completed = self._completed_tasks
+            self._pending_predecessors = {
+                task_path: sum(1 for pred in predecessors if pred not in completed)
+                for task_path, predecessors in self._predecessors.items()
+            }
+            self._ready_tasks = {
+                task_path
+                for task_path, count in self._pending_predecessors.items()
+                if count == 0 and task_path not in self._results
+            }
+            self._positions = {task_path: index for index, task_path in enumerate(self._tasks)}
+
+        # Return the tasks in the order in which they were added to the graph.
+        return [self._tasks[task_path] for task_path in sorted(self._ready_tasks, key=self._positions.__getitem__)]
 
     def get_successors(self, task: Task, ignore_groups: bool = True) -> list[Task]:
         """Returns the successors of the task in the original full build graph.
@@ -332,7 +478,7 @@ class TaskGraph(Graph):
         Never returns group tasks."""
 
         result = []
-        for task in (not_none(self._get_task(task_path)) for task_path in self._digraph.successors(task.path)):
+        for task in (self._tasks[task_path] for task_path in self._successors[task.path]):
             if ignore_groups and isinstance(task, GroupTask):
                 result += task.tasks
             else:
@@ -347,13 +493,26 @@ class TaskGraph(Graph):
 
         if not _force and (task.path in self._results and not self._results[task.path].is_started()):
             raise RuntimeError(f"already have a status for task {task.path!r}")
+        newly_completed = status.is_ok() and task.path not in self._completed_tasks
         self._results[task.path] = status
         if status.is_started():
             self._background_tasks.add(task.path)
-        if status.is_ok():
+        if newly_completed:
             self._completed_tasks.add(task.path)
+            if self._incomplete_count is not None and task.path in self._tasks:
+                self._incomplete_count -= 1
+
+        if self._pending_predecessors is not None and self._ready_tasks is not None:
+            self._ready_tasks.discard(task.path)
+            if newly_completed and task.path in self._tasks:
+                for succ in self._successors[task.path]:
+                    self._pending_predecessors[succ] -= 1
+                    if self._pending_predecessors[succ] == 0 and succ not in self._results:
+                        self._ready_tasks.add(succ)
 
     def is_complete(self) -> bool:
         """Returns `True` if, an only if, all tasks in the target subgraph have a non-failure result."""
 
-        return set(self._digraph.nodes).issubset(self._completed_tasks)
+        if self._incomplete_count is None:
+            self._incomplete_count = sum(1 for task_path in self._tasks if task_path not in self._completed_tasks)
+        return self._incomplete_count == 0
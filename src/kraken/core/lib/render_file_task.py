@@ -1,15 +1,12 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING, Union
+from typing import Union
 
 from kraken.core import Project, Property, Supplier, Task, TaskStatus
 from kraken.core.util.path import try_relative_to
 
-from .check_file_contents_task import as_bytes
-
-if TYPE_CHECKING:
-    from kraken.core.lib.check_file_contents_task import CheckFileContentsTask
+from .check_file_contents_task import CheckFileContentsTask, as_bytes
 
 DEFAULT_ENCODING = "utf-8"
 
@@ -37,8 +34,6 @@ class RenderFileTask(Task):
         description: str | None = None,
         group: str | None = "check",
     ) -> CheckFileContentsTask:
-        from kraken.core.lib.check_file_contents_task import CheckFileContentsTask
-
         task = self.project.do(
             name.replace("{name}", self.name),
             task_class or CheckFileContentsTask,
@@ -59,8 +54,6 @@ class RenderFileTask(Task):
         super().finalize()
 
     def prepare(self) -> TaskStatus | None:
-        from kraken.core.lib.check_file_contents_task import as_bytes
-
         file = self.file.get()
         if file.is_file() and file.read_bytes() == as_bytes(self.content.get(), self.encoding.get()):
             return TaskStatus.up_to_date(f'"{try_relative_to(file)}" is up to date')
@@ -3,15 +3,35 @@ related members from the :mod:`kraken.api` module; note that these members are o
 the context of a script executed by this loader and not otherwise. """
 
 from __future__ import annotations
+import __future__
 
 import abc
 import types
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Tuple
 
 if TYPE_CHECKING:
     from kraken.core.project import Project
 
+# Compiled build scripts, keyed by the path, modification time and size of the file they were compiled from.
+_CODE_CACHE: Dict[Tuple[str, int, int], types.CodeType] = {}
+
+
+def _compile_build_script(file: Path) -> types.CodeType:
+    """Compile the build script at *file*, or return the code compiled previously if the file has not changed.
+    Build scripts are compiled with postponed evaluation of annotations, like this module."""
+
+    filename = str(file)
+    stat = file.stat()
+    key = (filename, stat.st_mtime_ns, stat.st_size)
+    code = _CODE_CACHE.get(key)
+    if code is None:
+        code = compile(
+            file.read_text(), filename, "exec", flags=__future__.annotations.compiler_flag, dont_inherit=True
+        )
+        _CODE_CACHE[key] = code
+    return code
+
 
 class ProjectLoaderError(Exception):
     def __init__(self, project: Project, message: str) -> None:
@@ -35,11 +55,12 @@ class PythonScriptProjectLoader(ProjectLoader):
 
     def load_project(self, project: Project) -> None:
         file = project.directory / self.BUILD_SCRIPT
-        if not file.is_file():
+        try:
+            code = _compile_build_script(file)
+        except (FileNotFoundError, IsADirectoryError):
             raise ProjectLoaderError(project, f"file {file!r} does not exist")
 
         with project.as_current():
-            code = compile(file.read_text(), filename=file, mode="exec")
             module = types.ModuleType(project.path)
-            module.__file__ = str(file)
-            exec(code, vars(module))
+            module.__file__ = code.co_filename
+            exec(code, module.__dict__)
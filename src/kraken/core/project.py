@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sys
+import types
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Type, TypeVar, cast
 
@@ -23,15 +25,21 @@ class Project(MetadataContainer, Currentable["Project"]):
     metadata: list[Any]  #: A list of arbitrary objects that are usually looked up by type.
 
     def __init__(self, name: str, directory: Path, parent: Optional[Project], context: Context) -> None:
-        self.name = name
+        self.name = sys.intern(name)
         self.directory = directory
         self.parent = parent
         self.context = context
         self.metadata = []
+        self.__path: str | None = None
 
-        # We store all members that can be referenced by a fully qualified name in the same dictionary to ensure
-        # we're not accidentally allocating the same name twice.
-        self._members: dict[str, Task | Project] = {}
+        # Tasks and child projects share the same namespace, see :meth:`_has_member`.
+        self._tasks: dict[str, Task] = {}
+        self._children: dict[str, Project] = {}
+
+        # Read-only copies of :attr:`_tasks` and :attr:`_children` returned by :meth:`tasks` and :meth:`children`,
+        # reset whenever a member is added.
+        self._tasks_cache: Mapping[str, Task] | None = None
+        self._children_cache: Mapping[str, Project] | None = None
 
         apply_group = self.group(
             "apply", description="Tasks that perform automatic updates to the project consistency."
@@ -64,14 +72,20 @@ class Project(MetadataContainer, Currentable["Project"]):
 
     @property
     def path(self) -> str:
-        """Returns the path that uniquely identifies the project in the current build context."""
+        """Returns the path that uniquely identifies the project in the current build context. The path is
+        computed once, it does not reflect changes to the project hierarchy after it was first accessed."""
+
+        if self.__path is None:
+            if self.parent is None:
+                self.__path = ":"
+            elif self.parent.parent is None:
+                self.__path = sys.intern(f":{self.name}")
+            else:
+                self.__path = sys.intern(f"{self.parent.path}:{self.name}")
+        return self.__path
 
-        if self.parent is None:
-            return ":"
-        elif self.parent.parent is None:
-            return f":{self.name}"
-        else:
-            return f"{self.parent.path}:{self.name}"
+    def _has_member(self, name: str) -> bool:
+        return name in self._tasks or name in self._children
 
     @property
     def build_directory(self) -> Path:
@@ -83,16 +97,19 @@ class Project(MetadataContainer, Currentable["Project"]):
     def task(self, name: str) -> Task:
         """Return a task in the project by name."""
 
-        task = self._members[name]
-        if not isinstance(task, Task):
-            raise ValueError(f"name {name!r} does not refer to a task, but {type(task).__name__}")
-        return task
+        if name in self._children:
+            raise ValueError(f"name {name!r} does not refer to a task, but {type(self._children[name]).__name__}")
+        return self._tasks[name]
 
     def tasks(self) -> Mapping[str, Task]:
-        return {t.name: t for t in self._members.values() if isinstance(t, Task)}
+        if self._tasks_cache is None:
+            self._tasks_cache = types.MappingProxyType(dict(self._tasks))
+        return self._tasks_cache
 
     def children(self) -> Mapping[str, Project]:
-        return {p.name: p for p in self._members.values() if isinstance(p, Project)}
+        if self._children_cache is None:
+            self._children_cache = types.MappingProxyType(dict(self._children))
+        return self._children_cache
 
     def resolve_tasks(self, tasks: str | Task | Iterable[str | Task]) -> TaskSet:
         """Resolve tasks relative to the current project."""
@@ -116,11 +133,13 @@ class Project(MetadataContainer, Currentable["Project"]):
             ValueError: If a member with the same name already exists or if the task's project does not match
         """
 
-        if task.name in self._members:
+        if self._has_member(task.name):
             raise ValueError(f"{self} already has a member {task.name!r}, cannot add {task}")
         if task.project is not self:
             raise ValueError(f"{task}.project mismatch")
-        self._members[task.name] = task
+        self._tasks[task.name] = task
+        self._tasks_cache = None
+        self.context._bump_tasks()
 
     def add_child(self, project: Project) -> None:
         """Adds a project as a child project.
@@ -129,11 +148,14 @@ class Project(MetadataContainer, Currentable["Project"]):
             ValueError: If a member with the same name already exists or if the project's parent does not match
         """
 
-        if project.name in self._members:
+        if self._has_member(project.name):
             raise ValueError(f"{self} already has a member {project.name!r}, cannot add {project}")
         if project.parent is not self:
             raise ValueError(f"{project}.parent mismatch")
-        self._members[project.name] = project
+        self._children[project.name] = project
+        self._children_cache = None
+        self.context._bump_projects()
+        self.context._bump_tasks()
 
     def do(
         self,
@@ -155,7 +177,7 @@ class Project(MetadataContainer, Currentable["Project"]):
         :return: The created task.
         """
 
-        if name in self._members:
+        if self._has_member(name):
             raise ValueError(f"{self} already has a member {name!r}")
 
         task = task_type(name, self)
@@ -179,7 +201,7 @@ class Project(MetadataContainer, Currentable["Project"]):
         :param description: If specified, set the group's description.
         :param default: Whether the task group is run by default."""
 
-        task = self.tasks().get(name)
+        task = self._tasks.get(name)
         if task is None:
             task = self.do(name, GroupTask)
         elif not isinstance(task, GroupTask):
@@ -55,6 +55,8 @@ logger = logging.getLogger(__name__)
 class _Relationship(Generic[T]):
     """Represents a relationship to another task."""
 
+    __slots__ = ("other_task", "strict", "inverse")
+
     other_task: T
     strict: bool
     inverse: bool
@@ -106,6 +108,8 @@ class TaskStatusType(enum.Enum):
 class TaskStatus:
     """Represents a task status with a message."""
 
+    __slots__ = ("type", "message")
+
     type: TaskStatusType
     message: str | None
 
@@ -196,8 +200,9 @@ class Task(Object, abc.ABC):
     def __init__(self, name: str, project: Project) -> None:
         Object.__init__(self)
         self._capture = False
-        self.name = name
+        self.name = sys.intern(name)
         self.project = project
+        self.__path: str | None = None
         self.logger = logging.getLogger(f"{self.path} [{type(self).__module__}.{type(self).__qualname__}]")
         self.outputs = []
         self.__relationships: list[_Relationship[str | Task]] = []
@@ -225,12 +230,16 @@ class Task(Object, abc.ABC):
 
     @property
     def path(self) -> str:
-        """Returns the path of the task."""
+        """Returns the path of the task. The path is computed once, as neither the name of a task nor the
+        project hierarchy change after the task was created."""
 
-        if self.project.parent is None:
-            return f":{self.name}"
-        else:
-            return f"{self.project.path}:{self.name}"
+        if self.__path is None:
+            # The path is used as a key in many lookups, interning it allows for identity comparisons.
+            if self.project.parent is None:
+                self.__path = sys.intern(f":{self.name}")
+            else:
+                self.__path = sys.intern(f"{self.project.path}:{self.name}")
+        return self.__path
 
     def add_relationship(
         self,
@@ -354,7 +363,10 @@ class Task(Object, abc.ABC):
     def finalize(self) -> None:
         """This method is called by :meth:`Context.finalize()`. It gives the task a chance update its
         configuration before the build process is executed. The default implementation finalizes all non-output
-        properties, preventing them to be further mutated."""
+        properties, preventing them to be further mutated.
+
+        When the context is finalized with `parallel=True`, this method may be called concurrently with the
+        finalization of other tasks of the same project and must therefore not mutate state shared with them."""
 
         for key in self.__schema__:
             prop: Property[Any] = getattr(self, key)
@@ -13,6 +13,10 @@ from nr.stream import NotSet
 
 from kraken.core.util.helpers import flatten
 
+REGEX_LOCAL_REQUIREMENT = re.compile(r"(.+?)@(.+)")
+REGEX_PIP_REQUIREMENT = re.compile(r"([\w\d\-\_]+)(.*)")
+REGEX_SCRIPT_HEADER = re.compile(r"#\s*::\s*(requirements|pythonpath)(.+)")
+
 
 class Requirement(abc.ABC):
 
@@ -56,11 +60,11 @@ class LocalRequirement(Requirement):
 
 
 def parse_requirement(value: str) -> Requirement:
-    match = re.match(r"(.+?)@(.+)", value)
+    match = REGEX_LOCAL_REQUIREMENT.match(value)
     if match:
         return LocalRequirement(match.group(1).strip(), Path(match.group(2).strip()))
 
-    match = re.match(r"([\w\d\-\_]+)(.*)", value)
+    match = REGEX_PIP_REQUIREMENT.match(value)
     if match:
         return PipRequirement(match.group(1), match.group(2).strip() or None)
 
@@ -215,7 +219,7 @@ def parse_requirements_from_python_script(file: TextIO) -> RequirementSpec:
     for line in map(str.rstrip, file):
         if not line.startswith("#"):
             break
-        match = re.match(r"#\s*::\s*(requirements|pythonpath)(.+)", line)
+        match = REGEX_SCRIPT_HEADER.match(line)
         if not match:
             break
         args = shlex.split(match.group(2))
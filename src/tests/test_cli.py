@@ -0,0 +1,47 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from kraken.core.cli.main import main_internal
+
+BUILD_SCRIPT = """
+from kraken.core.executor.default import DefaultGraphExecutor, DefaultTaskExecutor
+from kraken.core.project import Project
+from kraken.core.task import Task
+
+
+class JobsTask(Task):
+    def execute(self) -> None:
+        (self.project.directory / "jobs.txt").write_text(str(self.project.context.executor.max_workers))
+
+
+project = Project.current()
+project.do("a", JobsTask)
+{setup}
+"""
+
+
+def _run(tmp_path: Path, setup: str, args: List[str]) -> "pytest.ExceptionInfo[SystemExit]":
+    (tmp_path / ".kraken.py").write_text(BUILD_SCRIPT.format(setup=setup))
+    argv = ["run", "-p", str(tmp_path), "-b", str(tmp_path / "build"), "--state-dir", str(tmp_path / "state")]
+    with pytest.raises(SystemExit) as excinfo:
+        main_internal("kraken", argv + ["--no-save", *args, ":a"])
+    return excinfo
+
+
+def test__kraken_run__jobs_must_be_positive(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert _run(tmp_path, "", ["-j", "0"]).value.code == 2
+    assert "must be at least 1, got 0" in capsys.readouterr().err
+    assert not (tmp_path / "jobs.txt").exists()
+
+
+def test__kraken_run__jobs_configures_the_default_executor(tmp_path: Path) -> None:
+    assert _run(tmp_path, "", ["-j", "2"]).value.code == 0
+    assert (tmp_path / "jobs.txt").read_text() == "2"
+
+
+def test__kraken_run__jobs_keeps_the_executor_of_the_build_script(tmp_path: Path) -> None:
+    setup = "project.context.executor = DefaultGraphExecutor(DefaultTaskExecutor(), max_workers=3)"
+    assert _run(tmp_path, setup, ["-j", "2"]).value.code == 0
+    assert (tmp_path / "jobs.txt").read_text() == "3"
@@ -0,0 +1,234 @@
+import contextvars
+import copy
+import pickle
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from kraken.core.context import BuildError, Context, ContextEvent
+from kraken.core.project import Project
+from kraken.core.task import Task, TaskStatus, VoidTask
+
+
+def test__Context__resolve_tasks__default_tasks_are_updated_after_finalize(kraken_project: Project) -> None:
+    task_a = kraken_project.do("a", VoidTask, default=True)
+    kraken_project.context.finalize()
+    assert task_a in kraken_project.context.resolve_tasks(None)
+
+    task_b = kraken_project.do("b", VoidTask, default=True)
+    assert {task_a, task_b}.issubset(kraken_project.context.resolve_tasks(None))
+
+
+def test__Context__resolve_tasks__respects_default_changed_after_finalize(kraken_project: Project) -> None:
+    task_a = kraken_project.do("a", VoidTask, default=True)
+    task_b = kraken_project.do("b", VoidTask)
+    kraken_project.context.finalize()
+    default_tasks = kraken_project.context.resolve_tasks(None)
+    assert task_a in default_tasks and task_b not in default_tasks
+
+    task_a.default = False
+    task_b.default = True
+    default_tasks = kraken_project.context.resolve_tasks(None)
+    assert task_a not in default_tasks and task_b in default_tasks
+
+
+def test__Context__iter_projects__sees_child_projects_added_later(kraken_project: Project) -> None:
+    context = kraken_project.context
+    assert list(context.iter_projects()) == [kraken_project]
+
+    child = Project("child", kraken_project.directory / "child", kraken_project, context)
+    kraken_project.add_child(child)
+    assert list(context.iter_projects()) == [kraken_project, child]
+
+
+def test__Context__resolve_tasks__by_name_matches_tasks_in_all_projects(kraken_project: Project) -> None:
+    context = kraken_project.context
+    child = Project("child", kraken_project.directory / "child", kraken_project, context)
+    kraken_project.add_child(child)
+
+    task_a = kraken_project.do("a", VoidTask)
+    assert context.resolve_tasks(["a"]) == [task_a]
+
+    child_task_a = child.do("a", VoidTask)
+    assert context.resolve_tasks(["a"]) == [task_a, child_task_a]
+    assert context.resolve_tasks(["b?"]) == []
+
+
+def test__Context__iter_projects__yields_projects_depth_first(kraken_project: Project) -> None:
+    context = kraken_project.context
+    a = Project("a", kraken_project.directory / "a", kraken_project, context)
+    kraken_project.add_child(a)
+    a_x = Project("x", a.directory / "x", a, context)
+    a.add_child(a_x)
+    b = Project("b", kraken_project.directory / "b", kraken_project, context)
+    kraken_project.add_child(b)
+
+    assert list(context.iter_projects()) == [kraken_project, a, a_x, b]
+
+
+def test__Context__resolve_tasks__nested_project_paths(kraken_project: Project) -> None:
+    context = kraken_project.context
+    child = Project("child", kraken_project.directory / "child", kraken_project, context)
+    kraken_project.add_child(child)
+    grandchild = Project("grandchild", child.directory / "grandchild", child, context)
+    child.add_child(grandchild)
+
+    task = grandchild.do("a", VoidTask)
+    default_task = grandchild.do("b", VoidTask, default=True)
+
+    assert context.resolve_tasks([":child:grandchild:a"]) == [task]
+    assert context.resolve_tasks(["child:grandchild:a"]) == [task]
+    assert context.resolve_tasks(["grandchild:a"], relative_to=child) == [task]
+    assert default_task in context.resolve_tasks([":child:grandchild"])
+    assert default_task in context.resolve_tasks([":child:grandchild:"])
+    assert context.resolve_tasks([":child:nope:a?"]) == []
+
+    with pytest.raises(ValueError, match=r"task ':child:grandchild:c' does not exist"):
+        context.resolve_tasks([":child:grandchild:c"])
+    with pytest.raises(ValueError, match=r"project :child:nope does not exist"):
+        context.resolve_tasks([":child:nope:a"])
+
+
+class FinalizeCountingTask(VoidTask):
+    finalized = 0
+
+    def finalize(self) -> None:
+        super().finalize()
+        assert Context.current() is self.project.context and Project.current(None) is not None
+        self.finalized += 1
+
+
+def test__Context__finalize__parallel_finalizes_all_tasks(kraken_project: Project) -> None:
+    child = Project("child", kraken_project.directory / "child", kraken_project, kraken_project.context)
+    kraken_project.add_child(child)
+    tasks = [kraken_project.do(f"a{i}", FinalizeCountingTask) for i in range(8)]
+    tasks.append(child.do("b", FinalizeCountingTask))
+
+    kraken_project.context.finalize(parallel=True)
+    assert [task.finalized for task in tasks] == [1] * len(tasks)
+
+
+def test__Context__resolve_tasks__deduplicates_overlapping_targets(kraken_project: Project) -> None:
+    task_a = kraken_project.do("a", VoidTask)
+    task_b = kraken_project.do("b", VoidTask)
+    assert kraken_project.context.resolve_tasks([":a", "a", "b", ":a"]) == [task_a, task_b]
+
+
+def test__BuildError__message() -> None:
+    assert str(BuildError([":a"])) == 'task ":a" failed'
+    assert str(BuildError([":b", ":a"])) == repr(BuildError([":a", ":b"])) == 'tasks ":a", ":b" failed'
+
+
+def test__BuildError__survives_pickle_and_copy() -> None:
+    error = BuildError([":b", ":a"])
+    for clone in (pickle.loads(pickle.dumps(error)), copy.copy(error), copy.deepcopy(error)):
+        assert clone.failed_tasks == {":a", ":b"}
+        assert str(clone) == 'tasks ":a", ":b" failed'
+
+
+def test__Context__supports_weak_references_and_plugin_attributes(kraken_ctx: Context) -> None:
+    assert weakref.ref(kraken_ctx)() is kraken_ctx
+    kraken_ctx.plugin_state = 42  # type: ignore[attr-defined]
+    assert vars(kraken_ctx)["plugin_state"] == 42
+
+
+def test__Context__current__is_local_to_the_thread(kraken_project: Project) -> None:
+    assert Context.current() is kraken_project.context
+    with ThreadPoolExecutor(1) as pool:
+        assert pool.submit(Context.current, None).result() is None
+
+
+def test__Context__current__is_only_visible_from_threads_that_copy_the_context(kraken_project: Project) -> None:
+    results: List[object] = []
+
+    def target() -> None:
+        for cls in (Context, Project):
+            try:
+                results.append(cls.current())
+            except RuntimeError as exc:
+                results.append(exc)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+
+    results.clear()
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(target,))
+    thread.start()
+    thread.join()
+    assert results == [kraken_project.context, kraken_project]
+
+
+class FailingTask(Task):
+    def execute(self) -> TaskStatus:
+        return TaskStatus.failed("oops")
+
+
+def test__Context__execute__reports_all_failed_tasks(kraken_project: Project) -> None:
+    kraken_project.do("a", FailingTask)
+    kraken_project.do("b", FailingTask)
+
+    with pytest.raises(BuildError) as excinfo:
+        kraken_project.context.execute([":a", ":b"])
+    assert excinfo.value.failed_tasks == {":a", ":b"}
+    assert excinfo.value.sorted_failed_tasks == (":a", ":b")
+
+
+def test__Context__get_build_graph__raises_for_empty_targets(kraken_project: Project) -> None:
+    kraken_project.do("a", VoidTask, default=True)
+    with pytest.raises(ValueError, match="no tasks selected"):
+        kraken_project.context.get_build_graph([])
+
+
+def test__Context__trigger__dispatches_to_listeners_registered_later(kraken_project: Project) -> None:
+    context = kraken_project.context
+    events: List[ContextEvent] = []
+    context.listen(ContextEvent.Type.on_project_loaded, events.append)
+    context.trigger(ContextEvent.Type.on_project_loaded, kraken_project)
+    context.listen(ContextEvent.Type.any, events.append)
+    context.trigger(ContextEvent.Type.on_project_loaded, kraken_project)
+
+    assert [event.type for event in events] == [ContextEvent.Type.on_project_loaded] * 3
+
+
+def test__Context__finalize__triggers_project_listeners_registered_during_finalize(kraken_project: Project) -> None:
+    context = kraken_project.context
+    events: List[ContextEvent] = []
+
+    def on_begin_finalize(event: ContextEvent) -> None:
+        context.listen(ContextEvent.Type.on_project_finalized, events.append)
+
+    context.listen(ContextEvent.Type.on_project_begin_finalize, on_begin_finalize)
+    context.finalize()
+
+    assert [event.data for event in events] == [kraken_project]
+
+
+def test__Context__get_build_graph__returns_fresh_graphs_for_repeated_calls(kraken_project: Project) -> None:
+    context = kraken_project.context
+    task_a = kraken_project.do("a", VoidTask)
+    context.finalize()
+
+    graph_1 = context.get_build_graph([":a"])
+    graph_1.set_status(task_a, TaskStatus.succeeded())
+    graph_2 = context.get_build_graph([":a"])
+    assert graph_2 is not graph_1
+    assert graph_2.get_status(task_a) is None
+
+    task_b = kraken_project.do("b", VoidTask)
+    assert set(context.get_build_graph([":b"]).tasks()) == {task_b}
+
+
+def test__Context__get_build_graph__sees_relationships_added_after_finalize(kraken_project: Project) -> None:
+    context = kraken_project.context
+    task_a = kraken_project.do("a", VoidTask)
+    task_b = kraken_project.do("b", VoidTask)
+    context.finalize()
+    assert list(context.get_build_graph([":b"]).tasks()) == [task_b]
+
+    task_b.add_relationship(task_a)
+    assert list(context.get_build_graph([":b"]).execution_order()) == [task_a, task_b]
@@ -0,0 +1,88 @@
+import threading
+import time
+from typing import Callable, List, Union
+
+import pytest
+
+from kraken.core.context import BuildError
+from kraken.core.executor.default import DefaultGraphExecutor, DefaultTaskExecutor
+from kraken.core.project import Project
+from kraken.core.task import Task, TaskStatus
+
+
+class RecordingTask(Task):
+    lock = threading.Lock()
+    order: List[str] = []
+
+    def execute(self) -> TaskStatus:
+        assert Project.current() is self.project
+        with self.lock:
+            self.order.append(self.name)
+        return TaskStatus.succeeded()
+
+
+def test__DefaultGraphExecutor__executes_tasks_concurrently_in_dependency_order(kraken_project: Project) -> None:
+    RecordingTask.order = []
+    task_a = kraken_project.do("a", RecordingTask)
+    for name in "bcd":
+        kraken_project.do(name, RecordingTask).add_relationship(task_a)
+    kraken_project.do("e", RecordingTask).add_relationship(":b")
+
+    kraken_project.context.executor = DefaultGraphExecutor(DefaultTaskExecutor(), max_workers=4)
+    kraken_project.context.execute([":c", ":d", ":e"])
+
+    order = RecordingTask.order
+    assert sorted(order) == ["a", "b", "c", "d", "e"]
+    assert order[0] == "a"
+    assert order.index("b") < order.index("e")
+
+
+class SleepingTask(RecordingTask):
+    def execute(self) -> TaskStatus:
+        time.sleep(0.05)
+        return super().execute()
+
+
+class InterruptingTask(Task):
+    def execute(self) -> TaskStatus:
+        raise KeyboardInterrupt
+
+
+def test__DefaultGraphExecutor__stops_scheduling_tasks_after_an_interrupt(kraken_project: Project) -> None:
+    RecordingTask.order = []
+    kraken_project.do("a", InterruptingTask)
+    for index in range(8):
+        kraken_project.do(f"t{index}", SleepingTask)
+
+    targets: List[Union[str, Task]] = [":a", *(f":t{index}" for index in range(8))]
+    kraken_project.context.executor = DefaultGraphExecutor(DefaultTaskExecutor(), max_workers=2)
+    with pytest.raises(BuildError):
+        kraken_project.context.execute(targets)
+
+    # Only the task that was running alongside the interrupted task was executed.
+    assert RecordingTask.order == ["t0"]
+
+
+class FailingTaskExecutor(DefaultTaskExecutor):
+    def execute_task(self, task: Task, done: Callable[[TaskStatus], None]) -> None:
+        if task.name == "a":
+            raise RuntimeError("executor failure")
+        super().execute_task(task, done)
+
+
+def test__DefaultGraphExecutor__reports_running_tasks_when_the_task_executor_fails(kraken_project: Project) -> None:
+    RecordingTask.order = []
+    kraken_project.do("a", RecordingTask)
+    for index in range(8):
+        kraken_project.do(f"t{index}", SleepingTask)
+
+    context = kraken_project.context
+    context.executor = DefaultGraphExecutor(FailingTaskExecutor(), max_workers=2)
+    context.finalize()
+    graph = context.get_build_graph([":a"] + [f":t{index}" for index in range(8)])
+    with pytest.raises(RuntimeError, match="executor failure"):
+        context.execute(graph)
+
+    assert RecordingTask.order == ["t0"]
+    task_t0 = kraken_project.task("t0")
+    assert graph.get_status(task_t0) == TaskStatus.succeeded()
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from kraken.core.context import Context
+from kraken.core.loader import ProjectLoaderError, PythonScriptProjectLoader, _compile_build_script
+from kraken.core.project import Project
+
+BUILD_SCRIPT = """
+from kraken.core.project import Project
+from kraken.core.task import VoidTask
+Project.current().do({name!r}, VoidTask)
+"""
+
+
+def test__PythonScriptProjectLoader__load_project__recompiles_changed_build_script(
+    kraken_ctx: Context, tmp_path: Path
+) -> None:
+    file = tmp_path / ".kraken.py"
+    file.write_text(BUILD_SCRIPT.format(name="a"))
+    project = Project("test", tmp_path, None, kraken_ctx)
+    PythonScriptProjectLoader().load_project(project)
+    assert "a" in project.tasks()
+
+    code = _compile_build_script(file)
+    assert _compile_build_script(file) is code
+    assert not (tmp_path / "__pycache__").exists()
+
+    file.write_text(BUILD_SCRIPT.format(name="bb"))
+    os.utime(file, ns=(1, 1))
+    project = Project("test", tmp_path, None, kraken_ctx)
+    PythonScriptProjectLoader().load_project(project)
+    assert "bb" in project.tasks() and "a" not in project.tasks()
+    assert _compile_build_script(file) is not code
+
+
+def test__PythonScriptProjectLoader__load_project__does_not_evaluate_annotations(
+    kraken_ctx: Context, tmp_path: Path
+) -> None:
+    file = tmp_path / ".kraken.py"
+    file.write_text(
+        "def f(x: UndefinedName, y: list[str] | None) -> UndefinedName: ...\n" + BUILD_SCRIPT.format(name="a")
+    )
+    project = Project("test", tmp_path, None, kraken_ctx)
+    PythonScriptProjectLoader().load_project(project)
+    assert "a" in project.tasks()
+
+
+def test__PythonScriptProjectLoader__load_project__raises_for_missing_build_script(
+    kraken_ctx: Context, tmp_path: Path
+) -> None:
+    (tmp_path / ".kraken.py").mkdir()
+    for directory in (tmp_path, tmp_path / "nope"):
+        project = Project("test", directory, None, kraken_ctx)
+        with pytest.raises(ProjectLoaderError, match="does not exist"):
+            PythonScriptProjectLoader().load_project(project)
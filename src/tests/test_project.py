@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+import pytest
+
 from kraken.core.project import Project
 from kraken.core.property import Property
 from kraken.core.task import Task, VoidTask
@@ -46,3 +48,26 @@ def test__Project__resolve_outputs_supplier(kraken_project: Project) -> None:
 
     kraken_project.do("carrier", MyTask, out_prop=MyDescriptor("foobar"))
     assert kraken_project.resolve_tasks(":carrier").select(MyDescriptor).supplier().get() == [MyDescriptor("foobar")]
+
+
+def test__Project__tasks_and_children__reflect_added_members(kraken_project: Project) -> None:
+    tasks = kraken_project.tasks()
+    assert "a" not in tasks and kraken_project.tasks() is tasks
+
+    task = kraken_project.do("a", VoidTask)
+    assert kraken_project.tasks()["a"] is task
+    assert "a" not in tasks
+
+    child = Project("child", kraken_project.directory / "child", kraken_project, kraken_project.context)
+    kraken_project.add_child(child)
+    assert kraken_project.children() == {"child": child}
+    assert "child" not in kraken_project.tasks()
+
+
+def test__Project__tasks_and_children__are_read_only(kraken_project: Project) -> None:
+    task = kraken_project.do("a", VoidTask)
+    with pytest.raises(TypeError):
+        kraken_project.tasks()["b"] = task  # type: ignore[index]
+    with pytest.raises(TypeError):
+        kraken_project.children()["child"] = kraken_project  # type: ignore[index]
+    assert "b" not in kraken_project.tasks()
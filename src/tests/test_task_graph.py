@@ -30,8 +30,8 @@ def test__TaskGraph__trim(kraken_project: Project) -> None:
     # Trimming should have the same result as a fresh populate.
     fresh_graph = TaskGraph(kraken_project.context, populate=False)
     fresh_graph.populate([group])
-    assert fresh_graph._digraph.nodes == graph._digraph.nodes
-    assert fresh_graph._digraph.edges == graph._digraph.edges
+    assert fresh_graph._tasks == graph._tasks
+    assert fresh_graph._successors == graph._successors
 
 
 def test__TaskGraph__trim_with_nested_groups(kraken_project: Project) -> None:
@@ -49,8 +49,8 @@ def test__TaskGraph__trim_with_nested_groups(kraken_project: Project) -> None:
     # Trimming should have the same result as a fresh populate.
     fresh_graph = TaskGraph(kraken_project.context, populate=False)
     fresh_graph.populate([group_1])
-    assert fresh_graph._digraph.nodes == graph._digraph.nodes
-    assert fresh_graph._digraph.edges == graph._digraph.edges
+    assert fresh_graph._tasks == graph._tasks
+    assert fresh_graph._successors == graph._successors
 
 
 def test__TaskGraph__ready_on_successful_completion(kraken_project: Project) -> None:
@@ -127,6 +127,19 @@ def test__TaskGraph__ready_on_failure(kraken_project: Project) -> None:
     assert not graph.is_complete()
 
 
+def test__TaskGraph__ready_after_restart(kraken_project: Project) -> None:
+    task_a = kraken_project.do("a", VoidTask)
+    task_b = kraken_project.do("b", VoidTask)
+    task_b.add_relationship(task_a)
+
+    graph = TaskGraph(kraken_project.context).trim([task_b])
+    graph.set_status(task_a, TaskStatus.succeeded())
+    assert list(graph.ready()) == [task_b]
+
+    graph.restart()
+    assert list(graph.ready()) == [task_a]
+
+
 def test__TaskGraph__ready_2(kraken_project: Project) -> None:
     """
     ```
@@ -218,3 +231,68 @@ def test__TaskGraph__test_inverse_group_relationship(kraken_project: Project, in
     assert graph.get_edge(a, tb1) == _Edge(True, True)
 
     assert list(graph.trim([b]).execution_order()) == [ta1, ta2, a, tb1, b]
+
+
+def test__TaskGraph__trim__deep_dependency_chain(kraken_project: Project) -> None:
+    tasks = [kraken_project.do("t0", VoidTask)]
+    for index in range(1, 3000):
+        tasks.append(kraken_project.do(f"t{index}", VoidTask))
+        tasks[-1].add_relationship(tasks[-2])
+
+    graph = TaskGraph(kraken_project.context).trim([tasks[-1]])
+    assert len(graph) == len(tasks)
+
+
+def test__TaskGraph__trim__raises_on_dependency_cycle(kraken_project: Project) -> None:
+    task_a = kraken_project.do("a", VoidTask)
+    task_b = kraken_project.do("b", VoidTask)
+    task_a.add_relationship(task_b)
+    task_b.add_relationship(task_a)
+
+    with pytest.raises(RuntimeError, match="encountered a dependency cycle"):
+        TaskGraph(kraken_project.context).trim([task_a])
+
+
+def test__TaskGraph__execution_order__updates_after_graph_changes(kraken_project: Project) -> None:
+    task_a = kraken_project.do("a", VoidTask)
+    graph = TaskGraph(kraken_project.context, populate=False)
+    graph.populate([task_a])
+    assert list(graph.execution_order()) == [task_a]
+
+    task_b = kraken_project.do("b", VoidTask)
+    task_b.add_relationship(task_a)
+    graph.populate([task_b])
+    assert list(graph.execution_order()) == [task_a, task_b]
+
+    graph.set_status(task_a, TaskStatus.succeeded())
+    assert list(graph.execution_order()) == [task_b]
+    assert list(graph.execution_order(all=True)) == [task_a, task_b]
+
+
+def test__TaskGraph__populate__deep_dependency_chain(kraken_project: Project) -> None:
+    # Each task depends on a task that is created after it, so that populating the graph must follow the chain.
+    tasks = [kraken_project.do(f"t{index}", VoidTask) for index in range(3000)]
+    for task, dependency in zip(tasks, tasks[1:]):
+        task.add_relationship(dependency)
+
+    graph = TaskGraph(kraken_project.context, populate=False)
+    graph.populate([tasks[0]])
+    assert list(graph.execution_order()) == tasks[::-1]
+
+
+def test__TaskGraph__reduce__removes_transitive_edges(kraken_project: Project) -> None:
+    task_a = kraken_project.do("a", VoidTask)
+    task_b = kraken_project.do("b", VoidTask)
+    task_c = kraken_project.do("c", VoidTask)
+    task_b.add_relationship(task_a)
+    task_c.add_relationship(task_a)
+    task_c.add_relationship(task_b)
+
+    graph = TaskGraph(kraken_project.context, populate=False)
+    graph.populate([task_c])
+    assert set(graph.get_predecessors(task_c)) == {task_a, task_b}
+
+    reduced = graph.reduce()
+    assert reduced.get_predecessors(task_c) == [task_b]
+    assert reduced.get_predecessors(task_b) == [task_a]
+    assert reduced.parent is graph